@@ -60,14 +60,13 @@ class URLAnalyzer:
             
             # Port Connectivity Test
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                connection_result = sock.connect_ex((hostname, port))
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(5)
+                    connection_result = sock.connect_ex((hostname, port))
                 result['connectivity_tests']['port'] = {
                     'success': connection_result == 0,
                     'port_open': connection_result == 0
                 }
-                sock.close()
             except Exception as e:
                 result['connectivity_tests']['port'] = {
                     'success': False,
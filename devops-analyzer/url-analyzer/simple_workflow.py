@@ -19,25 +19,32 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from simple_analyzer import SimpleAWSAnalyzer
+def _emit(lines):
+    """Write a block of lines to stdout in a single call."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 def run_simple_workflow(cluster_name: str, service_name: str, api_url: str):
     """Run a complete DevOps workflow with fallback analysis."""
     
-    print("🚀 Starting Simple DevOps Workflow")
-    print("="*60)
+    sys.stdout.write(f"""🚀 Starting Simple DevOps Workflow
+{"=" * 60}
+""")
+    sys.stdout.flush()
+    
+    # Imported lazily so the banner shows before boto3 is loaded
+    from simple_analyzer import SimpleAWSAnalyzer
     
     # Initialize analyzer
     analyzer = SimpleAWSAnalyzer(api_url)
     
     # Step 1: Architecture Analysis
-    print("\n📋 STEP 1: Architecture Analysis")
-    print("-" * 40)
+    _emit(["\n📋 STEP 1: Architecture Analysis", "-" * 40])
     analyzer.analyze_architecture(cluster_name)
     
     # Step 2: Service Health Check
-    print("\n💓 STEP 2: Service Health Check")
-    print("-" * 40)
+    _emit(["\n💓 STEP 2: Service Health Check", "-" * 40])
+    buf = []
     
     try:
         service_info = analyzer.get_cluster_summary(cluster_name)
@@ -45,43 +52,46 @@ def run_simple_workflow(cluster_name: str, service_name: str, api_url: str):
         target_service = next((s for s in services if s.get('name') == service_name), None)
         
         if target_service:
-            print(f"✅ Service '{service_name}' found:")
-            print(f"   Status: {target_service.get('status', 'Unknown')}")
-            print(f"   Running: {target_service.get('running', 0)}/{target_service.get('desired', 0)} tasks")
+            buf.append(f"✅ Service '{service_name}' found:")
+            buf.append(f"   Status: {target_service.get('status', 'Unknown')}")
+            buf.append(f"   Running: {target_service.get('running', 0)}/{target_service.get('desired', 0)} tasks")
             
             if target_service.get('running', 0) == target_service.get('desired', 0):
-                print("✅ Service is healthy")
+                buf.append("✅ Service is healthy")
             else:
-                print("⚠️  Service may have issues")
+                buf.append("⚠️  Service may have issues")
         else:
-            print(f"❌ Service '{service_name}' not found in cluster")
+            buf.append(f"❌ Service '{service_name}' not found in cluster")
     except Exception as e:
-        print(f"❌ Error checking service health: {e}")
+        buf.append(f"❌ Error checking service health: {e}")
+    
+    _emit(buf)
     
     # Step 3: Infrastructure Summary
-    print("\n📊 STEP 3: Infrastructure Summary")
-    print("-" * 40)
+    _emit(["\n📊 STEP 3: Infrastructure Summary", "-" * 40])
+    buf = []
     
     try:
         cluster_data = analyzer.get_cluster_summary(cluster_name)
         load_balancers = analyzer.get_load_balancers_summary()
         
-        print(f"🏗️  Cluster: {cluster_data.get('cluster_name', 'Unknown')}")
-        print(f"   Status: {cluster_data.get('status', 'Unknown')}")
-        print(f"   Running tasks: {cluster_data.get('running_tasks', 0)}")
-        print(f"   Active services: {cluster_data.get('active_services', 0)}")
-        print(f"⚖️  Load balancers: {len(load_balancers)}")
+        buf.append(f"🏗️  Cluster: {cluster_data.get('cluster_name', 'Unknown')}")
+        buf.append(f"   Status: {cluster_data.get('status', 'Unknown')}")
+        buf.append(f"   Running tasks: {cluster_data.get('running_tasks', 0)}")
+        buf.append(f"   Active services: {cluster_data.get('active_services', 0)}")
+        buf.append(f"⚖️  Load balancers: {len(load_balancers)}")
         
         for lb in load_balancers:
             state_emoji = "✅" if lb.get('state') == 'active' else "❌"
-            print(f"   {state_emoji} {lb.get('name', 'Unknown')} ({lb.get('type', 'Unknown')})")
+            buf.append(f"   {state_emoji} {lb.get('name', 'Unknown')} ({lb.get('type', 'Unknown')})")
             
     except Exception as e:
-        print(f"❌ Error getting infrastructure summary: {e}")
+        buf.append(f"❌ Error getting infrastructure summary: {e}")
+    
+    _emit(buf)
     
     # Step 4: Generate Summary Report
-    print("\n📄 STEP 4: Summary Report")
-    print("-" * 40)
+    _emit(["\n📄 STEP 4: Summary Report", "-" * 40])
     
     timestamp = datetime.now().isoformat()
     
@@ -161,10 +171,11 @@ def run_simple_workflow(cluster_name: str, service_name: str, api_url: str):
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(report)
     
-    print(f"📄 Summary report saved to: {filename}")
-    
-    print("\n🎉 Simple Workflow Completed Successfully!")
-    print("="*60)
+    _emit([
+        f"📄 Summary report saved to: {filename}",
+        "\n🎉 Simple Workflow Completed Successfully!",
+        "=" * 60,
+    ])
     
     return True
 
@@ -5,11 +5,33 @@ Quick Start Script for URL Issue Analyzer Web Interface
 This script starts the web interface and opens it in your browser.
 """
 
-import webbrowser
+import logging
 import time
 import subprocess
 import sys
 import os
+import threading
+
+# How long to wait for the server thread to bind its port
+STARTUP_TIMEOUT = 30
+
+def _browser_cmd():
+    """Return the platform command that opens a URL in the default browser."""
+    if sys.platform == 'darwin':
+        return ['open']
+    if sys.platform.startswith('win'):
+        return ['cmd', '/c', 'start', '']
+    return ['xdg-open']
+
+def _wait_for_server(server_thread, ready, timeout=STARTUP_TIMEOUT):
+    """Wait until the server thread has bound its port; False if it died or time ran out."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if ready.wait(0.1):
+            return True
+        if not server_thread.is_alive():
+            return False
+    return False
 
 def main():
     print("🚀 Starting URL Issue Analyzer Web Interface")
@@ -33,6 +55,15 @@ def main():
         subprocess.check_call([sys.executable, "-m", "pip", "install", "flask"])
         print("✅ Flask installed successfully")
     
+    # Check if waitress is installed (production WSGI server)
+    try:
+        import waitress
+        print("✅ Waitress is installed")
+    except ImportError:
+        print("❌ Waitress is not installed. Installing...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "waitress"])
+        print("✅ Waitress installed successfully")
+    
     print("\n🌐 Starting web server...")
     print("   Local: http://localhost:8080")
     print("   Network: http://0.0.0.0:8080")
@@ -44,23 +75,51 @@ def main():
     
     # Start the web interface in a subprocess
     try:
-        # Start the web interface
-        import threading
-        import web_interface
+        # Set by the server thread once port 8080 is bound to our server
+        ready = threading.Event()
         
         def run_server():
-            web_interface.app.run(host='0.0.0.0', port=8080, debug=False, use_reloader=False)
+            # Imported here so the banner above prints before Flask and the
+            # analyzer stack are loaded
+            try:
+                import web_interface
+                from waitress import create_server
+            except Exception as e:
+                print(f"❌ Failed to load web interface: {e}")
+                return
+            
+            # Thread-pool WSGI server so concurrent /analyze requests run in parallel.
+            # Requests spend most of their time waiting on probes and Ollama, so
+            # the pool is sized for I/O wait rather than CPU count.
+            try:
+                server = create_server(web_interface.app, host='0.0.0.0', port=8080, threads=16,
+                                       connection_limit=100, channel_timeout=120)
+            except OSError as e:
+                print(f"❌ Could not listen on port 8080: {e}")
+                return
+            
+            ready.set()
+            # Same startup line waitress.serve() prints
+            logging.basicConfig()
+            server.print_listen("Serving on http://{}:{}")
+            server.run()
         
         # Start server in background thread
         server_thread = threading.Thread(target=run_server, daemon=True)
         server_thread.start()
         
-        # Wait a moment for server to start
-        time.sleep(3)
+        # Only point the browser at the server once it is listening
+        if not _wait_for_server(server_thread, ready):
+            raise RuntimeError("server did not start listening on port 8080")
         
-        # Open browser
+        # Open browser detached so the script doesn't wait on it
         print("🌐 Opening web interface in browser...")
-        webbrowser.open('http://localhost:8080')
+        try:
+            subprocess.Popen(_browser_cmd() + ['http://localhost:8080'],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             start_new_session=True)
+        except OSError:
+            print("⚠️  Could not open a browser, visit http://localhost:8080 manually")
         
         print("\n✅ Web interface is running!")
         print("📝 Usage:")
@@ -4,32 +4,51 @@ Simple test script to verify API connectivity
 """
 
 import requests
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+session = requests.Session()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def check_health(api_url):
+    """Probe the health endpoint."""
+    return session.get(f"{api_url}/health", timeout=(1.0, 10.0))
+
+def check_analyze(api_url):
+    """Send a simple analyze request."""
+    simple_prompt = "Analyze this AWS ECS cluster with 2 services and 4 running tasks. Provide a brief architecture overview."
+    
+    # orjson emits UTF-8 bytes directly, so requests has nothing left to encode
+    payload = orjson.dumps({"prompt": simple_prompt, "context": "test"})
+    
+    return session.post(
+        f"{api_url}/api/analyze",
+        data=payload,
+        headers=JSON_HEADERS,
+        timeout=(2.0, 60.0)  # (connect, read): fail fast if the ALB isn't listening
+    )
 
 def test_api():
     api_url = "http://ollama-alb-427582956.us-east-1.elb.amazonaws.com"
     
     print("🧪 Testing Ollama API connectivity...")
     
+    # Both probes are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        health_future = executor.submit(check_health, api_url)
+        analyze_future = executor.submit(check_analyze, api_url)
+    
     # Test 1: Health check
     try:
-        response = requests.get(f"{api_url}/health", timeout=10)
+        response = health_future.result()
         print(f"✅ Health check: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
         print(f"❌ Health check failed: {e}")
-        return
     
     # Test 2: Simple analyze request
     try:
-        simple_prompt = "Analyze this AWS ECS cluster with 2 services and 4 running tasks. Provide a brief architecture overview."
-        
-        response = requests.post(
-            f"{api_url}/api/analyze",
-            json={"prompt": simple_prompt, "context": "test"},
-            headers={"Content-Type": "application/json"},
-            timeout=60
-        )
+        response = analyze_future.result()
         
         print(f"✅ Analyze API: {response.status_code}")
         if response.status_code == 200:
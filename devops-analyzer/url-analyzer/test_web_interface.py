@@ -4,9 +4,12 @@ Test script for the web interface URL analysis
 """
 
 import requests
-import json
+import orjson
 import time
 
+session = requests.Session()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 def test_url_analysis():
     """Test the URL analysis endpoint."""
     
@@ -17,7 +20,7 @@ def test_url_analysis():
     
     # Test health endpoint
     try:
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = session.get(f"{base_url}/health", timeout=5)
         print(f"✅ Health check: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
@@ -37,11 +40,11 @@ def test_url_analysis():
         
         try:
             start_time = time.time()
-            response = requests.post(
+            response = session.post(
                 f"{base_url}/analyze",
-                json={"url": url},
-                headers={"Content-Type": "application/json"},
-                timeout=60
+                data=orjson.dumps({"url": url}),
+                headers=JSON_HEADERS,
+                timeout=(2.0, 60.0)  # (connect, read)
             )
             end_time = time.time()
             
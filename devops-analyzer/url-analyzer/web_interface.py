@@ -10,30 +10,248 @@ Usage:
     Then open http://localhost:8080 in your browser
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
 from datetime import datetime
 import socket
 import urllib.parse
 import ssl
+import errno
+import selectors
 import subprocess
 import sys
+import time
+import copy
+import hashlib
+import http.cookiejar
+import threading
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 
 app = Flask(__name__, template_folder='templates')
 
+# Shared pool for the per-request connectivity probes. Each analysis submits
+# up to three I/O-bound probes, so size it for the server's request threads.
+_EXECUTOR = ThreadPoolExecutor(max_workers=32)
+
+# Short-lived result caches so bursts of identical requests skip the probes
+# and the Ollama round-trip
+_CONN_CACHE = TTLCache(maxsize=1024, ttl=60)
+_AI_CACHE = TTLCache(maxsize=256, ttl=60)
+_CACHE_LOCK = threading.Lock()
+
+# Prompt templates, built once at import; call with the fields to fill in
+_ANALYSIS_PROMPT = (
+    "Analyze this URL and diagnose the issues:\n"
+    "\n"
+    "URL: {url}\n"
+    "\n"
+    "Test Results:\n"
+    "{summary}\n"
+    "\n"
+    "Please provide:\n"
+    "1. Root cause analysis of the issues\n"
+    "2. Specific troubleshooting steps\n"
+    "3. Priority level (Critical/High/Medium/Low)\n"
+    "4. Estimated time to resolve\n"
+    "5. Prevention recommendations\n"
+    "\n"
+    "Be concise and actionable.\n"
+).format
+
+_CUSTOM_PROMPT = (
+    "A user is asking about this URL: {url}\n"
+    "\n"
+    "Their specific question is: \"{question}\"\n"
+    "\n"
+    "Here are the connectivity test results:\n"
+    "{summary}\n"
+    "\n"
+    "Please provide a detailed, specific answer to their question based on the connectivity data.\n"
+    "Focus on their specific concern and provide actionable recommendations.\n"
+    "Be thorough but concise.\n"
+).format
+
+# Seconds to wait for a TCP connect in the port probe
+_PORT_TIMEOUT = 2
+
+# connect_ex results meaning "still connecting"; Windows reports WSAEWOULDBLOCK
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+# hostname -> ip_address so one analysis resolves each host once. Hostnames
+# come from users, so the cache is bounded like the result caches above.
+_DNS_TTL = 120
+_DNS_CACHE = TTLCache(maxsize=1024, ttl=_DNS_TTL)
+_DNS_LOCK = threading.Lock()
+
+def resolve(hostname: str) -> str:
+    """Resolve a hostname to an IPv4 address, cached for _DNS_TTL seconds."""
+    with _DNS_LOCK:
+        ip_address = _DNS_CACHE.get(hostname)
+    if ip_address is not None:
+        return ip_address
+    
+    # Resolve outside the lock so one slow lookup doesn't block the others
+    ip_address = socket.getaddrinfo(hostname, None, family=socket.AF_INET)[0][4][0]
+    with _DNS_LOCK:
+        _DNS_CACHE[hostname] = ip_address
+    return ip_address
+
 class URLAnalyzer:
     def __init__(self, ollama_api_url: str):
         self.ollama_api_url = ollama_api_url
+        
+        # Shared session so probes and Ollama calls reuse keep-alive connections
+        self.session = requests.Session()
+        # Probes hit arbitrary user-supplied URLs; never keep their cookies, or
+        # one user's analysis would replay them on another user's probes
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        # No retries for probes: the diagnostic GET must report what a single
+        # request sees, and response_time must not include retries or backoff
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Dedicated pool for the Ollama API so its warm keep-alive connections
+        # aren't evicted by probe traffic to arbitrary hosts
+        self.session.mount(ollama_api_url, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+    
+    def _probe_dns(self, hostname: str):
+        """DNS resolution test. Returns (fields, errors, ip_address)."""
+        try:
+            ip_address = resolve(hostname)
+            return {'dns_resolution': {
+                'success': True,
+                'ip_address': ip_address
+            }}, [], ip_address
+        except Exception as e:
+            return {'dns_resolution': {
+                'success': False,
+                'error': str(e)
+            }}, [f"DNS Resolution failed: {str(e)}"], None
+    
+    def _probe_port(self, address: str, port: int):
+        """Port connectivity test. Returns (fields, errors)."""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                # Non-blocking connect, then wait for writability so an
+                # unreachable host costs at most _PORT_TIMEOUT seconds.
+                # SO_ERROR decides the result; on Windows the selector also
+                # reports a failed connect (exceptfds) as writable.
+                sock.setblocking(False)
+                err = sock.connect_ex((address, port))
+                if err in _CONNECT_IN_PROGRESS:
+                    with selectors.DefaultSelector() as sel:
+                        sel.register(sock, selectors.EVENT_WRITE)
+                        if sel.select(timeout=_PORT_TIMEOUT):
+                            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                        else:
+                            err = errno.ETIMEDOUT
+            return {'connectivity_tests': {'port': {
+                'success': err == 0,
+                'port_open': err == 0
+            }}}, []
+        except Exception as e:
+            return {'connectivity_tests': {'port': {
+                'success': False,
+                'error': str(e)
+            }}}, [f"Port connection failed: {str(e)}"]
+    
+    def _probe_ssl(self, address: str, hostname: str, port: int):
+        """SSL certificate test. Returns (fields, errors)."""
+        try:
+            ssl_context = ssl.create_default_context()
+            with socket.create_connection((address, port), timeout=5) as sock:
+                with ssl_context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                    cert = ssock.getpeercert() or {}
+            
+            # Flatten subject/issuer RDN tuples into plain dicts for the JSON response
+            subject = dict(rdn[0] for rdn in cert.get('subject', ()))
+            issuer = dict(rdn[0] for rdn in cert.get('issuer', ()))
+            return {'ssl_info': {
+                'success': True,
+                'subject': subject,
+                'issuer': issuer,
+                'version': cert.get('version'),
+                'serial_number': cert.get('serialNumber'),
+                'not_before': cert.get('notBefore'),
+                'not_after': cert.get('notAfter')
+            }}, []
+        except Exception as e:
+            return {'ssl_info': {
+                'success': False,
+                'error': str(e)
+            }}, [f"SSL Certificate issue: {str(e)}"]
+    
+    def _probe_http(self, url: str):
+        """HTTP status test. Returns (fields, errors)."""
+        try:
+            t0 = time.monotonic_ns()
+            response = self.session.get(url, timeout=(3, 10), allow_redirects=True)
+            elapsed_ms = (time.monotonic_ns() - t0) / 1_000_000
+            
+            fields = {
+                'http_status': {
+                    'status_code': response.status_code,
+                    'status_text': response.reason,
+                    'redirects': len(response.history),
+                    'final_url': response.url
+                },
+                'response_time': {
+                    'milliseconds': elapsed_ms
+                }
+            }
+            
+            # Check for common issues
+            if response.status_code >= 400:
+                return fields, [f"HTTP Error {response.status_code}: {response.reason}"]
+            return fields, []
+                
+        except requests.exceptions.Timeout:
+            return {'http_status': {
+                'error': 'Request timeout'
+            }}, ["Request timed out"]
+        except requests.exceptions.ConnectionError as e:
+            return {'http_status': {
+                'error': 'Connection error'
+            }}, [f"Connection error: {str(e)}"]
+        except Exception as e:
+            return {'http_status': {
+                'error': str(e)
+            }}, [f"HTTP request failed: {str(e)}"]
     
-    def analyze_url_connectivity(self, url: str) -> dict:
-        """Analyze URL connectivity and basic issues."""
+    def analyze_url_connectivity(self, url: str, parsed=None) -> dict:
+        """Analyze URL connectivity and basic issues.
+        
+        ``parsed`` may be passed in when the caller has already split the URL.
+        """
         try:
             # Parse URL
-            parsed = urllib.parse.urlparse(url)
+            if parsed is None:
+                parsed = urllib.parse.urlsplit(url)
             hostname = parsed.hostname
             port = parsed.port or (443 if parsed.scheme == 'https' else 80)
             
+            cache_key = (parsed.scheme, (hostname or '').lower(), port, parsed.path, parsed.query)
+            with _CACHE_LOCK:
+                cached = _CONN_CACHE.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
             result = {
                 'url': url,
                 'hostname': hostname,
@@ -47,95 +265,35 @@ class URLAnalyzer:
                 'errors': []
             }
             
-            # DNS Resolution Test
-            try:
-                ip_address = socket.gethostbyname(hostname)
-                result['dns_resolution'] = {
-                    'success': True,
-                    'ip_address': ip_address
-                }
-            except Exception as e:
-                result['dns_resolution'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-                result['errors'].append(f"DNS Resolution failed: {str(e)}")
+            # DNS first: the port and SSL probes connect to the resolved address
+            fields, errors, ip_address = self._probe_dns(hostname)
+            result.update(fields)
+            result['errors'].extend(errors)
+            address = ip_address or hostname
+            
+            # Remaining probes are independent, so run them concurrently
+            futures = [
+                ('port', _EXECUTOR.submit(self._probe_port, address, port)),
+                ('http', _EXECUTOR.submit(self._probe_http, url))
+            ]
+            if parsed.scheme == 'https':
+                futures.insert(1, ('ssl', _EXECUTOR.submit(self._probe_ssl, address, hostname, port)))
             
-            # Port Connectivity Test
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                connection_result = sock.connect_ex((hostname, port))
-                result['connectivity_tests']['port'] = {
-                    'success': connection_result == 0,
-                    'port_open': connection_result == 0
-                }
-                sock.close()
-            except Exception as e:
-                result['connectivity_tests']['port'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-                result['errors'].append(f"Port connection failed: {str(e)}")
+            concurrent.futures.wait([f for _, f in futures], timeout=15)
             
-            # SSL Certificate Test (for HTTPS)
-            if parsed.scheme == 'https':
-                try:
-                    ssl_context = ssl.create_default_context()
-                    with socket.create_connection((hostname, port), timeout=5) as sock:
-                        with ssl_context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                            cert = ssock.getpeercert()
-                            result['ssl_info'] = {
-                                'success': True,
-                                'subject': cert.get('subject'),
-                                'issuer': cert.get('issuer'),
-                                'version': cert.get('version'),
-                                'serial_number': cert.get('serialNumber'),
-                                'not_before': cert.get('notBefore'),
-                                'not_after': cert.get('notAfter')
-                            }
-                except Exception as e:
-                    result['ssl_info'] = {
-                        'success': False,
-                        'error': str(e)
-                    }
-                    result['errors'].append(f"SSL Certificate issue: {str(e)}")
+            # Merge in a fixed order so the error list stays deterministic
+            for name, future in futures:
+                if not future.done():
+                    result['errors'].append(f"{name.upper()} check did not finish in time")
+                    continue
+                fields, errors = future.result()
+                if 'connectivity_tests' in fields:
+                    result['connectivity_tests'].update(fields.pop('connectivity_tests'))
+                result.update(fields)
+                result['errors'].extend(errors)
             
-            # HTTP Status Test
-            try:
-                start_time = datetime.now()
-                response = requests.get(url, timeout=10, allow_redirects=True)
-                end_time = datetime.now()
-                
-                result['http_status'] = {
-                    'status_code': response.status_code,
-                    'status_text': response.reason,
-                    'redirects': len(response.history),
-                    'final_url': response.url
-                }
-                result['response_time'] = {
-                    'milliseconds': (end_time - start_time).total_seconds() * 1000
-                }
-                
-                # Check for common issues
-                if response.status_code >= 400:
-                    result['errors'].append(f"HTTP Error {response.status_code}: {response.reason}")
-                    
-            except requests.exceptions.Timeout:
-                result['http_status'] = {
-                    'error': 'Request timeout'
-                }
-                result['errors'].append("Request timed out")
-            except requests.exceptions.ConnectionError as e:
-                result['http_status'] = {
-                    'error': 'Connection error'
-                }
-                result['errors'].append(f"Connection error: {str(e)}")
-            except Exception as e:
-                result['http_status'] = {
-                    'error': str(e)
-                }
-                result['errors'].append(f"HTTP request failed: {str(e)}")
+            with _CACHE_LOCK:
+                _CONN_CACHE[cache_key] = copy.deepcopy(result)
             
             return result
             
@@ -146,85 +304,131 @@ class URLAnalyzer:
                 'errors': [str(e)]
             }
     
+    def _request_ai_analysis(self, prompt: str, context: str, timeout) -> dict:
+        """POST a prompt to the AI API, reusing a cached answer for identical prompts."""
+        key = hashlib.blake2b(f"{context}\0{prompt}".encode(), digest_size=16).digest()
+        with _CACHE_LOCK:
+            cached = _AI_CACHE.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        response = self.session.post(
+            f"{self.ollama_api_url}/api/analyze",
+            json={"prompt": prompt, "context": context},
+            headers={"Content-Type": "application/json"},
+            timeout=timeout
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            with _CACHE_LOCK:
+                _AI_CACHE[key] = copy.deepcopy(result)
+            return result
+        else:
+            return {
+                'error': f'AI API returned status {response.status_code}',
+                'response': response.text
+            }
+    
+    def _build_summary(self, cd: dict) -> list:
+        """Build the plain-text connectivity summary used in AI prompts."""
+        dns = cd.get('dns_resolution') or {}
+        port_ok = ((cd.get('connectivity_tests') or {}).get('port') or {}).get('success')
+        ssl_ok = (cd.get('ssl_info') or {}).get('success')
+        status = (cd.get('http_status') or {}).get('status_code')
+        response_time = cd.get('response_time')
+        errors = cd.get('errors')
+        port = cd.get('port')
+        
+        summary = []
+        
+        if dns.get('success'):
+            summary.append(f"✅ DNS resolves to {dns['ip_address']}")
+        else:
+            summary.append("❌ DNS resolution failed")
+        
+        if port_ok:
+            summary.append(f"✅ Port {port} is open")
+        else:
+            summary.append(f"❌ Port {port} is closed or blocked")
+        
+        if ssl_ok:
+            summary.append("✅ SSL certificate is valid")
+        else:
+            summary.append("❌ SSL certificate issue detected")
+        
+        if status:
+            if 200 <= status < 300:
+                summary.append(f"✅ HTTP status {status} (OK)")
+            elif 300 <= status < 400:
+                summary.append(f"⚠️  HTTP status {status} (Redirect)")
+            else:
+                summary.append(f"❌ HTTP status {status} (Error)")
+        
+        if response_time:
+            ms = response_time['milliseconds']
+            if ms < 1000:
+                summary.append(f"✅ Response time {ms:.0f}ms (Good)")
+            elif ms < 3000:
+                summary.append(f"⚠️  Response time {ms:.0f}ms (Slow)")
+            else:
+                summary.append(f"❌ Response time {ms:.0f}ms (Very slow)")
+        
+        # List all errors
+        if errors:
+            summary.append("\n🚨 Issues detected:")
+            for error in errors:
+                summary.append(f"   • {error}")
+        
+        return summary
+    
+    def _build_connectivity_section(self, cd: dict) -> str:
+        """Build the markdown connectivity checklist used in fallback reports."""
+        dns = cd.get('dns_resolution') or {}
+        port_ok = ((cd.get('connectivity_tests') or {}).get('port') or {}).get('success')
+        ssl_ok = (cd.get('ssl_info') or {}).get('success')
+        http_status = cd.get('http_status') or {}
+        status = http_status.get('status_code')
+        response_time = cd.get('response_time')
+        port = cd.get('port')
+        
+        lines = []
+        
+        if dns.get('success'):
+            lines.append(f"✅ **DNS Resolution:** {dns['ip_address']}\n")
+        else:
+            lines.append("❌ **DNS Resolution:** Failed\n")
+        
+        if port_ok:
+            lines.append(f"✅ **Port {port}:** Open\n")
+        else:
+            lines.append(f"❌ **Port {port}:** Closed or blocked\n")
+        
+        if ssl_ok:
+            lines.append("✅ **SSL Certificate:** Valid\n")
+        else:
+            lines.append("❌ **SSL Certificate:** Invalid or expired\n")
+        
+        if status:
+            lines.append(f"{'✅' if 200 <= status < 300 else '❌'} **HTTP Status:** {status} {http_status['status_text']}\n")
+        
+        if response_time:
+            ms = response_time['milliseconds']
+            lines.append(f"{'✅' if ms < 1000 else '⚠️'} **Response Time:** {ms:.0f}ms\n")
+        
+        return "".join(lines)
+    
     def get_ai_analysis(self, url: str, connectivity_data: dict) -> dict:
         """Get AI analysis of URL issues."""
         try:
             # Create a summary of connectivity data
-            summary = []
-            
-            if connectivity_data.get('dns_resolution', {}).get('success'):
-                summary.append(f"✅ DNS resolves to {connectivity_data['dns_resolution']['ip_address']}")
-            else:
-                summary.append(f"❌ DNS resolution failed")
-            
-            if connectivity_data.get('connectivity_tests', {}).get('port', {}).get('success'):
-                summary.append(f"✅ Port {connectivity_data['port']} is open")
-            else:
-                summary.append(f"❌ Port {connectivity_data['port']} is closed or blocked")
-            
-            if connectivity_data.get('ssl_info', {}).get('success'):
-                summary.append(f"✅ SSL certificate is valid")
-            else:
-                summary.append(f"❌ SSL certificate issue detected")
-            
-            if connectivity_data.get('http_status', {}).get('status_code'):
-                status = connectivity_data['http_status']['status_code']
-                if 200 <= status < 300:
-                    summary.append(f"✅ HTTP status {status} (OK)")
-                elif 300 <= status < 400:
-                    summary.append(f"⚠️  HTTP status {status} (Redirect)")
-                else:
-                    summary.append(f"❌ HTTP status {status} (Error)")
-            
-            if connectivity_data.get('response_time'):
-                response_time = connectivity_data['response_time']['milliseconds']
-                if response_time < 1000:
-                    summary.append(f"✅ Response time {response_time:.0f}ms (Good)")
-                elif response_time < 3000:
-                    summary.append(f"⚠️  Response time {response_time:.0f}ms (Slow)")
-                else:
-                    summary.append(f"❌ Response time {response_time:.0f}ms (Very slow)")
-            
-            # List all errors
-            if connectivity_data.get('errors'):
-                summary.append("\n🚨 Issues detected:")
-                for error in connectivity_data['errors']:
-                    summary.append(f"   • {error}")
+            summary = self._build_summary(connectivity_data)
             
             # Create prompt for AI
-            prompt = f"""
-            Analyze this URL and diagnose the issues:
-            
-            URL: {url}
-            
-            Test Results:
-            {chr(10).join(summary)}
-            
-            Please provide:
-            1. Root cause analysis of the issues
-            2. Specific troubleshooting steps
-            3. Priority level (Critical/High/Medium/Low)
-            4. Estimated time to resolve
-            5. Prevention recommendations
-            
-            Be concise and actionable.
-            """
+            prompt = _ANALYSIS_PROMPT(url=url, summary="\n".join(summary))
             
             # Call AI API
-            response = requests.post(
-                f"{self.ollama_api_url}/api/analyze",
-                json={"prompt": prompt, "context": "url-troubleshooting"},
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    'error': f'AI API returned status {response.status_code}',
-                    'response': response.text
-                }
+            return self._request_ai_analysis(prompt, "url-troubleshooting", timeout=(3, 30))
                 
         except requests.exceptions.Timeout:
             return {'error': 'AI API timeout - using fallback analysis'}
@@ -235,76 +439,13 @@ class URLAnalyzer:
         """Get custom AI analysis based on user's specific question."""
         try:
             # Create a summary of connectivity data
-            summary = []
-            
-            if connectivity_data.get('dns_resolution', {}).get('success'):
-                summary.append(f"✅ DNS resolves to {connectivity_data['dns_resolution']['ip_address']}")
-            else:
-                summary.append(f"❌ DNS resolution failed")
-            
-            if connectivity_data.get('connectivity_tests', {}).get('port', {}).get('success'):
-                summary.append(f"✅ Port {connectivity_data['port']} is open")
-            else:
-                summary.append(f"❌ Port {connectivity_data['port']} is closed or blocked")
-            
-            if connectivity_data.get('ssl_info', {}).get('success'):
-                summary.append(f"✅ SSL certificate is valid")
-            else:
-                summary.append(f"❌ SSL certificate issue detected")
-            
-            if connectivity_data.get('http_status', {}).get('status_code'):
-                status = connectivity_data['http_status']['status_code']
-                if 200 <= status < 300:
-                    summary.append(f"✅ HTTP status {status} (OK)")
-                elif 300 <= status < 400:
-                    summary.append(f"⚠️  HTTP status {status} (Redirect)")
-                else:
-                    summary.append(f"❌ HTTP status {status} (Error)")
-            
-            if connectivity_data.get('response_time'):
-                response_time = connectivity_data['response_time']['milliseconds']
-                if response_time < 1000:
-                    summary.append(f"✅ Response time {response_time:.0f}ms (Good)")
-                elif response_time < 3000:
-                    summary.append(f"⚠️  Response time {response_time:.0f}ms (Slow)")
-                else:
-                    summary.append(f"❌ Response time {response_time:.0f}ms (Very slow)")
-            
-            # List all errors
-            if connectivity_data.get('errors'):
-                summary.append("\n🚨 Issues detected:")
-                for error in connectivity_data['errors']:
-                    summary.append(f"   • {error}")
+            summary = self._build_summary(connectivity_data)
             
             # Create custom prompt for AI based on user's question
-            prompt = f"""
-            A user is asking about this URL: {url}
-            
-            Their specific question is: "{question}"
-            
-            Here are the connectivity test results:
-            {chr(10).join(summary)}
-            
-            Please provide a detailed, specific answer to their question based on the connectivity data.
-            Focus on their specific concern and provide actionable recommendations.
-            Be thorough but concise.
-            """
-            
-            # Call AI API
-            response = requests.post(
-                f"{self.ollama_api_url}/api/analyze",
-                json={"prompt": prompt, "context": "custom-url-analysis"},
-                headers={"Content-Type": "application/json"},
-                timeout=15  # Reduced timeout for faster response
-            )
+            prompt = _CUSTOM_PROMPT(url=url, question=question, summary="\n".join(summary))
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    'error': f'AI API returned status {response.status_code}',
-                    'response': response.text
-                }
+            # Call AI API (reduced read timeout for faster response)
+            return self._request_ai_analysis(prompt, "custom-url-analysis", timeout=(3, 15))
                 
         except requests.exceptions.Timeout:
             return {'error': 'AI API timeout - using fallback analysis'}
@@ -313,183 +454,169 @@ class URLAnalyzer:
     
     def generate_fallback_custom_analysis(self, url: str, question: str, connectivity_data: dict) -> str:
         """Generate fallback analysis when AI is unavailable."""
-        analysis = f"""
+        now_iso = datetime.now().isoformat()
+        parts = [f"""
 # Custom Analysis for: {question}
 
 **URL:** {url}
-**Analyzed:** {datetime.now().isoformat()}
+**Analyzed:** {now_iso}
 
 ## 🔍 Connectivity Summary
 
-"""
+"""]
         
-        if connectivity_data.get('dns_resolution', {}).get('success'):
-            analysis += f"✅ **DNS Resolution:** {connectivity_data['dns_resolution']['ip_address']}\n"
-        else:
-            analysis += "❌ **DNS Resolution:** Failed\n"
-        
-        if connectivity_data.get('connectivity_tests', {}).get('port', {}).get('success'):
-            analysis += f"✅ **Port {connectivity_data['port']}:** Open\n"
-        else:
-            analysis += f"❌ **Port {connectivity_data['port']}:** Closed or blocked\n"
-        
-        if connectivity_data.get('ssl_info', {}).get('success'):
-            analysis += "✅ **SSL Certificate:** Valid\n"
-        else:
-            analysis += "❌ **SSL Certificate:** Invalid or expired\n"
+        parts.append(self._build_connectivity_section(connectivity_data))
         
-        if connectivity_data.get('http_status', {}).get('status_code'):
-            status = connectivity_data['http_status']['status_code']
-            analysis += f"{'✅' if 200 <= status < 300 else '❌'} **HTTP Status:** {status} {connectivity_data['http_status']['status_text']}\n"
-        
-        if connectivity_data.get('response_time'):
-            response_time = connectivity_data['response_time']['milliseconds']
-            analysis += f"{'✅' if response_time < 1000 else '⚠️'} **Response Time:** {response_time:.0f}ms\n"
-        
-        analysis += f"""
+        parts.append(f"""
 ## 🤖 Specific Analysis for Your Question
 
 **Your Question:** "{question}"
 
 ### Analysis Based on Connectivity Data
 
-"""
+""")
         
         # Provide specific analysis based on the actual question and connectivity data
         question_lower = question.lower()
         
+        # Read the connectivity values once; the branches below only use these locals
+        response_time = connectivity_data.get('response_time') or {}
+        rt_ms = response_time.get('milliseconds', 0)
+        http_code = (connectivity_data.get('http_status') or {}).get('status_code', 0)
+        error_count = len(connectivity_data.get('errors') or [])
+        
         # Check for specific issues in connectivity data
-        has_dns_issues = not connectivity_data.get('dns_resolution', {}).get('success')
-        has_port_issues = not connectivity_data.get('connectivity_tests', {}).get('port', {}).get('success')
-        has_ssl_issues = not connectivity_data.get('ssl_info', {}).get('success')
-        has_http_errors = connectivity_data.get('http_status', {}).get('status_code', 200) >= 400
-        has_slow_response = connectivity_data.get('response_time', {}).get('milliseconds', 0) > 2000
+        has_dns_issues = not (connectivity_data.get('dns_resolution') or {}).get('success')
+        has_port_issues = not ((connectivity_data.get('connectivity_tests') or {}).get('port') or {}).get('success')
+        has_ssl_issues = not (connectivity_data.get('ssl_info') or {}).get('success')
+        has_http_errors = http_code >= 400
+        has_slow_response = rt_ms > 2000
         
         if 'improve' in question_lower or 'optimiz' in question_lower:
-            analysis += "### 🚀 Improvement Opportunities:\n\n"
+            parts.append("### 🚀 Improvement Opportunities:\n\n")
             
             if has_slow_response:
-                analysis += "**Performance Issues Detected:**\n"
-                analysis += f"• Response time is {connectivity_data['response_time']['milliseconds']:.0f}ms (should be <1000ms)\n"
-                analysis += "• Consider implementing caching (CDN, Redis)\n"
-                analysis += "• Optimize images and static assets\n"
-                analysis += "• Use compression (gzip, brotli)\n"
-                analysis += "• Consider load balancing for better distribution\n\n"
+                parts.append("**Performance Issues Detected:**\n")
+                parts.append(f"• Response time is {rt_ms:.0f}ms (should be <1000ms)\n")
+                parts.append("• Consider implementing caching (CDN, Redis)\n")
+                parts.append("• Optimize images and static assets\n")
+                parts.append("• Use compression (gzip, brotli)\n")
+                parts.append("• Consider load balancing for better distribution\n\n")
             
             if has_dns_issues:
-                analysis += "**DNS Issues:**\n"
-                analysis += "• DNS resolution is failing - check DNS configuration\n"
-                analysis += "• Consider using a faster DNS provider\n"
-                analysis += "• Implement DNS caching and monitoring\n\n"
+                parts.append("**DNS Issues:**\n")
+                parts.append("• DNS resolution is failing - check DNS configuration\n")
+                parts.append("• Consider using a faster DNS provider\n")
+                parts.append("• Implement DNS caching and monitoring\n\n")
             
             if has_ssl_issues:
-                analysis += "**SSL/TLS Issues:**\n"
-                analysis += "• SSL certificate problems detected\n"
-                analysis += "• Update to modern TLS protocols (1.2, 1.3)\n"
-                analysis += "• Implement certificate auto-renewal\n"
-                analysis += "• Use HSTS for better security\n\n"
+                parts.append("**SSL/TLS Issues:**\n")
+                parts.append("• SSL certificate problems detected\n")
+                parts.append("• Update to modern TLS protocols (1.2, 1.3)\n")
+                parts.append("• Implement certificate auto-renewal\n")
+                parts.append("• Use HSTS for better security\n\n")
             
             if not any([has_slow_response, has_dns_issues, has_ssl_issues, has_port_issues]):
-                analysis += "**Current Status:** No major connectivity issues detected.\n\n"
-                analysis += "**General Improvements:**\n"
-                analysis += "• Set up comprehensive monitoring\n"
-                analysis += "• Implement automated health checks\n"
-                analysis += "• Use performance monitoring tools\n"
-                analysis += "• Consider implementing a CDN for global performance\n"
-                analysis += "• Set up alerting for proactive issue detection\n\n"
+                parts.append("**Current Status:** No major connectivity issues detected.\n\n")
+                parts.append("**General Improvements:**\n")
+                parts.append("• Set up comprehensive monitoring\n")
+                parts.append("• Implement automated health checks\n")
+                parts.append("• Use performance monitoring tools\n")
+                parts.append("• Consider implementing a CDN for global performance\n")
+                parts.append("• Set up alerting for proactive issue detection\n\n")
         
         elif 'slow' in question_lower or 'performance' in question_lower:
-            analysis += "### ⚡ Performance Analysis:\n\n"
+            parts.append("### ⚡ Performance Analysis:\n\n")
             
             if has_slow_response:
-                analysis += f"**Performance Issues Found:**\n"
-                analysis += f"• Response time: {connectivity_data['response_time']['milliseconds']:.0f}ms (slow)\n"
-                analysis += "• Server appears to be under load or experiencing latency\n"
-                analysis += "• Network latency may be affecting performance\n\n"
-                analysis += "**Recommendations:**\n"
-                analysis += "• Check server CPU/memory utilization\n"
-                analysis += "• Implement caching at multiple levels\n"
-                analysis += "• Use a Content Delivery Network (CDN)\n"
-                analysis += "• Optimize database queries and indexing\n"
-                analysis += "• Consider horizontal scaling with load balancers\n"
+                parts.append(f"**Performance Issues Found:**\n")
+                parts.append(f"• Response time: {rt_ms:.0f}ms (slow)\n")
+                parts.append("• Server appears to be under load or experiencing latency\n")
+                parts.append("• Network latency may be affecting performance\n\n")
+                parts.append("**Recommendations:**\n")
+                parts.append("• Check server CPU/memory utilization\n")
+                parts.append("• Implement caching at multiple levels\n")
+                parts.append("• Use a Content Delivery Network (CDN)\n")
+                parts.append("• Optimize database queries and indexing\n")
+                parts.append("• Consider horizontal scaling with load balancers\n")
             else:
-                analysis += "**Performance Status:** Response times are acceptable\n"
-                analysis += "**Monitoring Recommendations:**\n"
-                analysis += "• Set up performance baselines\n"
-                analysis += "• Monitor response time trends\n"
-                analysis += "• Implement performance alerting\n"
+                parts.append("**Performance Status:** Response times are acceptable\n")
+                parts.append("**Monitoring Recommendations:**\n")
+                parts.append("• Set up performance baselines\n")
+                parts.append("• Monitor response time trends\n")
+                parts.append("• Implement performance alerting\n")
         
         elif 'secure' in question_lower or 'security' in question_lower:
-            analysis += "### 🔒 Security Analysis:\n\n"
+            parts.append("### 🔒 Security Analysis:\n\n")
             
             if has_ssl_issues:
-                analysis += "**Security Issues Detected:**\n"
-                analysis += "• SSL certificate problems - this is a critical security issue\n"
-                analysis += "• Encrypted traffic may not be working properly\n\n"
-                analysis += "**Immediate Actions:**\n"
-                analysis += "• Renew or fix SSL certificate immediately\n"
-                analysis += "• Implement HTTPS redirects\n"
-                analysis += "• Add security headers (HSTS, CSP, X-Frame-Options)\n"
-                analysis += "• Regular security scanning and vulnerability assessment\n"
+                parts.append("**Security Issues Detected:**\n")
+                parts.append("• SSL certificate problems - this is a critical security issue\n")
+                parts.append("• Encrypted traffic may not be working properly\n\n")
+                parts.append("**Immediate Actions:**\n")
+                parts.append("• Renew or fix SSL certificate immediately\n")
+                parts.append("• Implement HTTPS redirects\n")
+                parts.append("• Add security headers (HSTS, CSP, X-Frame-Options)\n")
+                parts.append("• Regular security scanning and vulnerability assessment\n")
             else:
-                analysis += "**Security Status:** Basic security measures appear functional\n"
-                analysis += "**Additional Security Recommendations:**\n"
-                analysis += "• Implement Web Application Firewall (WAF)\n"
-                analysis += "• Use security monitoring and logging\n"
-                analysis += "• Regular penetration testing\n"
-                analysis += "• Implement rate limiting and DDoS protection\n"
+                parts.append("**Security Status:** Basic security measures appear functional\n")
+                parts.append("**Additional Security Recommendations:**\n")
+                parts.append("• Implement Web Application Firewall (WAF)\n")
+                parts.append("• Use security monitoring and logging\n")
+                parts.append("• Regular penetration testing\n")
+                parts.append("• Implement rate limiting and DDoS protection\n")
         
         elif 'reliable' in question_lower or 'avail' in question_lower:
-            analysis += "### 🛡️ Reliability Analysis:\n\n"
+            parts.append("### 🛡️ Reliability Analysis:\n\n")
             
             if any([has_dns_issues, has_port_issues, has_ssl_issues, has_http_errors]):
-                analysis += "**Reliability Issues Detected:**\n"
+                parts.append("**Reliability Issues Detected:**\n")
                 if has_dns_issues:
-                    analysis += "• DNS resolution failures affect reliability\n"
+                    parts.append("• DNS resolution failures affect reliability\n")
                 if has_port_issues:
-                    analysis += "• Port connectivity issues indicate service downtime\n"
+                    parts.append("• Port connectivity issues indicate service downtime\n")
                 if has_ssl_issues:
-                    analysis += "• SSL issues may prevent secure connections\n"
+                    parts.append("• SSL issues may prevent secure connections\n")
                 if has_http_errors:
-                    analysis += f"• HTTP errors ({connectivity_data['http_status']['status_code']}) indicate service problems\n\n"
+                    parts.append(f"• HTTP errors ({http_code}) indicate service problems\n\n")
                 
-                analysis += "**Reliability Improvements:**\n"
-                analysis += "• Implement health checks and monitoring\n"
-                analysis += "• Set up automated failover mechanisms\n"
-                analysis += "• Use multiple availability zones\n"
-                analysis += "• Implement circuit breakers for resilience\n"
+                parts.append("**Reliability Improvements:**\n")
+                parts.append("• Implement health checks and monitoring\n")
+                parts.append("• Set up automated failover mechanisms\n")
+                parts.append("• Use multiple availability zones\n")
+                parts.append("• Implement circuit breakers for resilience\n")
             else:
-                analysis += "**Reliability Status:** Service appears stable\n"
-                analysis += "**Enhancement Recommendations:**\n"
-                analysis += "• Set up comprehensive monitoring dashboards\n"
-                analysis += "• Implement proactive alerting\n"
-                analysis += "• Regular disaster recovery testing\n"
-                analysis += "• Consider multi-region deployment for critical services\n"
+                parts.append("**Reliability Status:** Service appears stable\n")
+                parts.append("**Enhancement Recommendations:**\n")
+                parts.append("• Set up comprehensive monitoring dashboards\n")
+                parts.append("• Implement proactive alerting\n")
+                parts.append("• Regular disaster recovery testing\n")
+                parts.append("• Consider multi-region deployment for critical services\n")
         
         else:
             # Generic analysis for other questions
-            analysis += "### 📊 Analysis Based on Current Status:\n\n"
+            parts.append("### 📊 Analysis Based on Current Status:\n\n")
             
             if any([has_dns_issues, has_port_issues, has_ssl_issues, has_http_errors]):
-                analysis += "**Issues Requiring Attention:**\n"
+                parts.append("**Issues Requiring Attention:**\n")
                 if has_dns_issues:
-                    analysis += "• Fix DNS resolution issues\n"
+                    parts.append("• Fix DNS resolution issues\n")
                 if has_port_issues:
-                    analysis += "• Investigate port connectivity problems\n"
+                    parts.append("• Investigate port connectivity problems\n")
                 if has_ssl_issues:
-                    analysis += "• Address SSL certificate problems\n"
+                    parts.append("• Address SSL certificate problems\n")
                 if has_http_errors:
-                    analysis += f"• Resolve HTTP error {connectivity_data['http_status']['status_code']}\n"
+                    parts.append(f"• Resolve HTTP error {http_code}\n")
             else:
-                analysis += "**Status:** No critical connectivity issues detected\n"
+                parts.append("**Status:** No critical connectivity issues detected\n")
             
-            analysis += f"\n**General Recommendations:**\n"
-            analysis += "• Implement continuous monitoring\n"
-            analysis += "• Set up automated health checks\n"
-            analysis += "• Document current architecture and configurations\n"
-            analysis += "• Regular performance and security assessments\n"
+            parts.append(f"\n**General Recommendations:**\n")
+            parts.append("• Implement continuous monitoring\n")
+            parts.append("• Set up automated health checks\n")
+            parts.append("• Document current architecture and configurations\n")
+            parts.append("• Regular performance and security assessments\n")
         
-        analysis += f"""
+        parts.append(f"""
 
 ## 📊 Immediate Action Items
 
@@ -501,19 +628,19 @@ class URLAnalyzer:
 ## 🔍 Technical Details
 
 - **URL Tested**: {url}
-- **Test Time**: {datetime.now().isoformat()}
-- **Connectivity Issues**: {len(connectivity_data.get('errors', []))}
-- **Response Time**: {connectivity_data.get('response_time', {}).get('milliseconds', 'N/A')}ms
+- **Test Time**: {now_iso}
+- **Connectivity Issues**: {error_count}
+- **Response Time**: {response_time.get('milliseconds', 'N/A')}ms
 
 ---
 *This analysis was generated automatically based on connectivity tests. For AI-powered insights, ensure the analysis service is available.*
-"""
+""")
         
-        return analysis
+        return "".join(parts)
 
     def generate_fallback_analysis(self, url: str, connectivity_data: dict) -> str:
         """Generate fallback analysis when AI is unavailable."""
-        analysis = f"""
+        parts = [f"""
 # URL Issue Analysis Report
 
 **URL:** {url}
@@ -522,40 +649,19 @@ class URLAnalyzer:
 ## 🔍 Test Results
 
 ### Connectivity Tests
-"""
-        
-        if connectivity_data.get('dns_resolution', {}).get('success'):
-            analysis += f"✅ **DNS Resolution:** {connectivity_data['dns_resolution']['ip_address']}\n"
-        else:
-            analysis += "❌ **DNS Resolution:** Failed\n"
-        
-        if connectivity_data.get('connectivity_tests', {}).get('port', {}).get('success'):
-            analysis += f"✅ **Port {connectivity_data['port']}:** Open\n"
-        else:
-            analysis += f"❌ **Port {connectivity_data['port']}:** Closed or blocked\n"
+"""]
         
-        if connectivity_data.get('ssl_info', {}).get('success'):
-            analysis += "✅ **SSL Certificate:** Valid\n"
-        else:
-            analysis += "❌ **SSL Certificate:** Invalid or expired\n"
-        
-        if connectivity_data.get('http_status', {}).get('status_code'):
-            status = connectivity_data['http_status']['status_code']
-            analysis += f"{'✅' if 200 <= status < 300 else '❌'} **HTTP Status:** {status} {connectivity_data['http_status']['status_text']}\n"
-        
-        if connectivity_data.get('response_time'):
-            response_time = connectivity_data['response_time']['milliseconds']
-            analysis += f"{'✅' if response_time < 1000 else '⚠️'} **Response Time:** {response_time:.0f}ms\n"
+        parts.append(self._build_connectivity_section(connectivity_data))
         
-        analysis += "\n## 🚨 Issues Found\n"
+        parts.append("\n## 🚨 Issues Found\n")
         
         if connectivity_data.get('errors'):
             for error in connectivity_data['errors']:
-                analysis += f"• {error}\n"
+                parts.append(f"• {error}\n")
         else:
-            analysis += "No critical issues detected.\n"
+            parts.append("No critical issues detected.\n")
         
-        analysis += """
+        parts.append("""
 ## 🔧 Troubleshooting Steps
 
 ### General Steps
@@ -573,18 +679,18 @@ class URLAnalyzer:
 - **Slow Response:** Check server load, network latency
 
 ## 📊 Priority Assessment
-"""
+""")
         
         # Determine priority
         errors = connectivity_data.get('errors', [])
         if not errors:
-            analysis += "🟢 **Priority: Low** - No critical issues\n"
+            parts.append("🟢 **Priority: Low** - No critical issues\n")
         elif len(errors) <= 2:
-            analysis += "🟡 **Priority: Medium** - Some issues detected\n"
+            parts.append("🟡 **Priority: Medium** - Some issues detected\n")
         else:
-            analysis += "🔴 **Priority: High** - Multiple critical issues\n"
+            parts.append("🔴 **Priority: High** - Multiple critical issues\n")
         
-        analysis += """
+        parts.append("""
 ## 🛡️ Prevention Recommendations
 - Implement monitoring and alerting
 - Use load balancers for high availability
@@ -594,9 +700,64 @@ class URLAnalyzer:
 
 ---
 *This analysis was generated automatically. For AI-powered insights, ensure the analysis service is available.*
-"""
+""")
         
-        return analysis
+        return "".join(parts)
+
+def jsonify_fast(obj) -> Response:
+    """jsonify() replacement backed by orjson for the large analysis payloads."""
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json')
+
+def _normalize(url: str):
+    """Add a default https:// scheme if missing; return (url, split result)."""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ('http', 'https'):
+        url = 'https://' + url
+        parsed = urllib.parse.urlsplit(url)
+    return url, parsed
+
+def _ai_fields(url: str, connectivity_data: dict) -> dict:
+    """Run the AI analysis and return its ai_analysis/ai_metadata response fields."""
+    print("🤖 Getting AI analysis...")
+    ai_result = analyzer.get_ai_analysis(url, connectivity_data)
+    
+    if ai_result and not ai_result.get('error'):
+        return {
+            'ai_analysis': ai_result.get('response', 'No AI response available'),
+            'ai_metadata': {
+                'processing_time_ms': ai_result.get('processing_time_ms', 0),
+                'model': ai_result.get('model', 'unknown')
+            }
+        }
+    return {
+        'ai_analysis': analyzer.generate_fallback_analysis(url, connectivity_data),
+        'ai_metadata': {
+            'error': ai_result.get('error', 'AI analysis unavailable'),
+            'fallback': True
+        }
+    }
+
+def _stream_analysis(url: str, parsed):
+    """Yield the /analyze result as NDJSON: a connectivity line, then an ai line."""
+    try:
+        print(f"🔍 Analyzing URL: {url}")
+        connectivity_data = analyzer.analyze_url_connectivity(url, parsed=parsed)
+        yield orjson.dumps({
+            'phase': 'connectivity',
+            'data': {
+                'url': url,
+                'connectivity': connectivity_data,
+                'timestamp': datetime.now().isoformat()
+            }
+        }, option=orjson.OPT_APPEND_NEWLINE)
+        
+        yield orjson.dumps({
+            'phase': 'ai',
+            'data': _ai_fields(url, connectivity_data)
+        }, option=orjson.OPT_APPEND_NEWLINE)
+    except Exception as e:
+        yield orjson.dumps({'phase': 'error', 'error': f'Analysis failed: {str(e)}'},
+                           option=orjson.OPT_APPEND_NEWLINE)
 
 # Initialize analyzer
 OLLAMA_API_URL = "http://ollama-alb-427582956.us-east-1.elb.amazonaws.com"
@@ -618,16 +779,17 @@ def analyze_url():
             return jsonify({'error': 'URL is required'}), 400
         
         # Add scheme if missing
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+        url, parsed = _normalize(url)
+        
+        # Clients that accept NDJSON get the connectivity results as soon as
+        # the probes finish instead of waiting for the AI call as well
+        if 'application/x-ndjson' in request.headers.get('Accept', ''):
+            return Response(stream_with_context(_stream_analysis(url, parsed)),
+                            mimetype='application/x-ndjson')
         
         # Perform connectivity analysis
         print(f"🔍 Analyzing URL: {url}")
-        connectivity_data = analyzer.analyze_url_connectivity(url)
-        
-        # Get AI analysis
-        print("🤖 Getting AI analysis...")
-        ai_result = analyzer.get_ai_analysis(url, connectivity_data)
+        connectivity_data = analyzer.analyze_url_connectivity(url, parsed=parsed)
         
         # Prepare response
         response = {
@@ -635,21 +797,9 @@ def analyze_url():
             'connectivity': connectivity_data,
             'timestamp': datetime.now().isoformat()
         }
+        response.update(_ai_fields(url, connectivity_data))
         
-        if ai_result and not ai_result.get('error'):
-            response['ai_analysis'] = ai_result.get('response', 'No AI response available')
-            response['ai_metadata'] = {
-                'processing_time_ms': ai_result.get('processing_time_ms', 0),
-                'model': ai_result.get('model', 'unknown')
-            }
-        else:
-            response['ai_analysis'] = analyzer.generate_fallback_analysis(url, connectivity_data)
-            response['ai_metadata'] = {
-                'error': ai_result.get('error', 'AI analysis unavailable'),
-                'fallback': True
-            }
-        
-        return jsonify(response)
+        return jsonify_fast(response)
         
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
@@ -669,13 +819,12 @@ def analyze_url_custom():
             return jsonify({'error': 'Question is required'}), 400
         
         # Add scheme if missing
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+        url, parsed = _normalize(url)
         
         # Perform basic connectivity analysis
         print(f"🔍 Analyzing URL: {url}")
         print(f"❓ User question: {question}")
-        connectivity_data = analyzer.analyze_url_connectivity(url)
+        connectivity_data = analyzer.analyze_url_connectivity(url, parsed=parsed)
         
         # Get custom AI analysis
         print("🤖 Getting custom AI analysis...")
@@ -702,7 +851,7 @@ def analyze_url_custom():
                 'fallback': True
             }
         
-        return jsonify(response)
+        return jsonify_fast(response)
         
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
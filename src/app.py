@@ -13,6 +13,7 @@ Endpoints:
 - GET  /health              : Health check for load balancer
 - GET  /metrics             : Prometheus metrics
 - POST /api/analyze         : AI analysis endpoint
+- POST /api/analyze/batch   : Several analysis prompts in one request
 - GET  /api/models          : List available models
 - GET  /                    : API information
 
@@ -26,17 +27,27 @@ Environment Variables:
 - LOG_LEVEL                : Logging level (default: INFO)
 """
 
+import hashlib
+import itertools
 import json
 import logging
 import os
+import random
+import re
 import sys
+import threading
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Tuple
 
+import orjson
 import requests
-from flask import Flask, jsonify, request, Response, g
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from flask import Flask, jsonify, request, Response, g, stream_with_context, copy_current_request_context
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from prometheus_flask_exporter import PrometheusMetrics
 
 # =============================================================================
@@ -55,11 +66,31 @@ class Config:
     
     # API configuration
     MAX_PROMPT_LENGTH = 10000  # Maximum prompt length to accept
+    MAX_BATCH_SIZE = 16  # Maximum prompts per /api/analyze/batch request
+    BATCH_WORKERS = 8  # Ollama calls in flight per batch pool
     OLLAMA_TIMEOUT = 300  # Timeout for Ollama requests
+    OLLAMA_CONNECT_TIMEOUT = 3  # Fail fast when Ollama isn't listening
     OLLAMA_MAX_RETRIES = 3
+    BACKOFF_BASE = 0.25  # Seconds; doubled on each retry
+    BACKOFF_CAP = 2.0  # Upper bound on a single retry delay
+    MODELS_CACHE_TTL = 5  # Seconds to reuse the model list between lookups
+    MODELS_STALE_TTL = 300  # Serve the last good list this long if Ollama is unreachable
+    RESPONSE_CACHE_SIZE = 256  # Distinct (model, prompt) answers kept for repeat requests
+    
+    # Response compression (flask-compress): Brotli first, gzip fallback, JSON only.
+    # Small bodies like /health aren't worth the CPU.
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_BR_LEVEL = 4
+    COMPRESS_MIMETYPES = ['application/json']
     
     # Preferred models in order of preference
     PREFERRED_MODELS = ['llama3.1', 'llama3', 'llama2', 'mistral', 'neural-chat']
+    # Lookahead so every start position is tried and overlapping names still match
+    PREFERRED_RE = re.compile(
+        '(?=(' + '|'.join(re.escape(p) for p in PREFERRED_MODELS) + '))', re.IGNORECASE
+    )
+    PREFERRED_RANK = {p.lower(): i for i, p in enumerate(PREFERRED_MODELS)}
 
 
 def setup_logging(log_level: str = 'INFO') -> logging.Logger:
@@ -87,9 +118,39 @@ def setup_logging(log_level: str = 'INFO') -> logging.Logger:
     return logger
 
 
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson.
+    
+    Replaces Flask's stdlib json provider so jsonify() and request.get_json()
+    go through orjson. Naive datetimes are treated as UTC and serialized with
+    a 'Z' suffix.
+    """
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    
+    # Same attribute names as DefaultJSONProvider: never sort keys and never
+    # pretty-print, even in debug mode (orjson output is always compact)
+    sort_keys = False
+    compact = True
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option),
+                                        mimetype='application/json')
+
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
+Compress(app)
 
 # Setup logging
 logger = setup_logging(Config.LOG_LEVEL)
@@ -101,20 +162,6 @@ metrics.info('ollama_gateway_info', 'Ollama Gateway Metadata',
              environment=Config.ENVIRONMENT,
              aws_region=Config.AWS_REGION)
 
-@app.route('/health')
-def health():
-    """Health check endpoint for load balancer."""
-    logger.info("Health check request received")
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'environment': Config.ENVIRONMENT,
-        'ollama_url': Config.OLLAMA_URL
-    })
-
-# Setup logging
-logger = setup_logging(Config.LOG_LEVEL)
-
 logger.info(f"Starting Ollama Gateway - Environment: {Config.ENVIRONMENT}")
 logger.debug(f"Ollama URL: {Config.OLLAMA_URL}")
 logger.debug(f"AWS Region: {Config.AWS_REGION}")
@@ -127,25 +174,40 @@ app_start_time = time.time()
 # Request Tracking and Logging
 # =============================================================================
 
+# Request IDs only need to be unique for tracing, not unguessable, so a
+# pid-prefixed counter replaces uuid4. Reset after fork so each gunicorn
+# worker gets its own prefix even when the app is preloaded.
+_PID = os.getpid()
+_request_counter = itertools.count(1)
+
+
+def _reset_request_ids() -> None:
+    global _PID, _request_counter
+    _PID = os.getpid()
+    _request_counter = itertools.count(1)
+
+
+os.register_at_fork(after_in_child=_reset_request_ids)
+
+
 @app.before_request
 def add_request_id():
     """Add unique request ID for tracing."""
-    request_id = request.headers.get('X-Request-ID', str(uuid.uuid4()))
+    request_id = request.headers.get('X-Request-ID') or f"{_PID}-{next(_request_counter):x}"
     g.request_id = request_id
     request.id = request_id
 
 
-@app.after_request
-def add_security_headers(response):
-    """Add request ID and CORS headers."""
-    response.headers['X-Request-ID'] = g.get('request_id', 'unknown')
-    
-    # CORS headers for demo.html access
-    response.headers['Access-Control-Allow-Origin'] = '*'
-    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Request-ID'
-    
-    return response
+def _json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """Build a JSON response from orjson bytes, skipping jsonify's argument handling."""
+    return Response(orjson.dumps(payload, option=OrjsonProvider.option),
+                    status=status, mimetype='application/json')
+
+
+# Fixed layout of a successful /api/analyze body; each %s takes an
+# orjson-encoded value so only the values are serialized per request
+_ANALYZE_TEMPLATE = (b'{"response":%s,"model":%s,"context":%s,'
+                     b'"processing_time_ms":%s,"cached":%s,"timestamp":%s}')
 
 
 def get_client_ip():
@@ -157,28 +219,83 @@ def get_client_ip():
 # Ollama Integration
 # =============================================================================
 
+# Shared keep-alive connection pool for all Ollama calls. Retries are handled
+# by the callers, so the adapter itself doesn't retry.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+# The model list rarely changes, so analyze() and /api/models share a
+# short-lived copy instead of asking Ollama on every request. The stale cache
+# keeps the last good list around for when Ollama briefly drops out.
+_models_cache = TTLCache(maxsize=1, ttl=Config.MODELS_CACHE_TTL)
+_models_stale = TTLCache(maxsize=1, ttl=Config.MODELS_STALE_TTL)
+_models_lock = threading.Lock()
+
+# Monitoring pipelines tend to send the same prompt over and over; answers
+# are kept per (model, prompt digest) so repeats skip the generation
+_response_cache = LRUCache(maxsize=Config.RESPONSE_CACHE_SIZE)
+_response_cache_lock = threading.Lock()
+
+
+# Ollama payloads are encoded and decoded with orjson instead of requests' stdlib json
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Parse an Ollama response body with orjson, raising a RequestException like response.json()."""
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON from Ollama: {e}", response=response) from e
+
+
+def _backoff(attempt: int) -> float:
+    """Capped exponential backoff with full jitter, so retrying workers don't sync up."""
+    return min(Config.BACKOFF_CAP, Config.BACKOFF_BASE * (2 ** attempt)) * random.random()
+
+
 def _get_ollama_models() -> list:
     """
     Fetch available models from Ollama with retry logic.
     
+    Results are cached for Config.MODELS_CACHE_TTL seconds. If Ollama can't
+    be reached, the last good list is returned for up to
+    Config.MODELS_STALE_TTL seconds before the error is raised.
+    
     Returns:
         List of model names or empty list on error
     """
+    with _models_lock:
+        cached = _models_cache.get('models')
+    if cached is not None:
+        return list(cached)
+    
     for attempt in range(Config.OLLAMA_MAX_RETRIES):
         try:
-            response = requests.get(
+            response = _session.get(
                 f"{Config.OLLAMA_URL}/api/tags",
-                timeout=5
+                timeout=(Config.OLLAMA_CONNECT_TIMEOUT, 5)
             )
             response.raise_for_status()
-            models = response.json().get('models', [])
-            return [m.get('name') for m in models if m.get('name')]
+            models = _json_body(response).get('models', [])
+            names = tuple(m.get('name') for m in models if m.get('name'))
+            with _models_lock:
+                _models_cache['models'] = names
+                _models_stale['models'] = names
+            return list(names)
         except requests.RequestException as e:
             logger.debug(f"Ollama connection attempt {attempt + 1} failed: {e}")
             if attempt == Config.OLLAMA_MAX_RETRIES - 1:
                 logger.error(f"Failed to connect to Ollama after {Config.OLLAMA_MAX_RETRIES} attempts")
+                with _models_lock:
+                    stale = _models_stale.get('models')
+                if stale is not None:
+                    logger.warning("Serving cached model list while Ollama is unreachable")
+                    return list(stale)
                 raise
-            time.sleep(0.5 * (2 ** attempt))  
+            time.sleep(_backoff(attempt))
 
 
 def _select_best_model(models: list) -> str:
@@ -199,12 +316,19 @@ def _select_best_model(models: list) -> str:
     if not models:
         raise ValueError("No Ollama models available")
     
-    # Try preferred models in order
-    for preferred in Config.PREFERRED_MODELS:
-        for model in models:
-            if preferred.lower() in model.lower():
-                logger.debug(f"[{g.request_id}] Selected preferred model: {model}")
-                return model
+    # One regex pass per model; keep the best-ranked preference, first model on ties
+    best_model, best_rank = None, len(Config.PREFERRED_MODELS)
+    for model in models:
+        for match in Config.PREFERRED_RE.finditer(model):
+            rank = Config.PREFERRED_RANK[match.group(1).lower()]
+            if rank < best_rank:
+                best_model, best_rank = model, rank
+        if best_rank == 0:
+            break
+    
+    if best_model is not None:
+        logger.debug(f"[{g.request_id}] Selected preferred model: {best_model}")
+        return best_model
     
     # Fallback to first available
     logger.debug(f"[{g.request_id}] No preferred model found, using first available: {models[0]}")
@@ -234,14 +358,15 @@ def _call_ollama(model: str, prompt: str) -> str:
                 'stream': False
             }
             
-            response = requests.post(
+            response = _session.post(
                 f"{Config.OLLAMA_URL}/api/generate",
-                json=payload,
-                timeout=Config.OLLAMA_TIMEOUT
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=(Config.OLLAMA_CONNECT_TIMEOUT, Config.OLLAMA_TIMEOUT)
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_body(response)
             if 'response' not in data:
                 raise ValueError(f"Invalid Ollama response: {data}")
             
@@ -254,39 +379,104 @@ def _call_ollama(model: str, prompt: str) -> str:
             logger.warning(f"[{g.request_id}] Ollama timeout (attempt {attempt + 1}/{Config.OLLAMA_MAX_RETRIES}): {e}")
             if attempt == Config.OLLAMA_MAX_RETRIES - 1:
                 raise requests.RequestException(f"Ollama request timed out after {Config.OLLAMA_MAX_RETRIES} attempts")
-            time.sleep(0.5 * (2 ** attempt))  # Exponential backoff
+            time.sleep(_backoff(attempt))
             
         except requests.RequestException as e:
             logger.warning(f"[{g.request_id}] Ollama call failed (attempt {attempt + 1}/{Config.OLLAMA_MAX_RETRIES}): {e}")
             if attempt == Config.OLLAMA_MAX_RETRIES - 1:
                 raise
-            time.sleep(0.5 * (2 ** attempt))  # Exponential backoff
+            time.sleep(_backoff(attempt))
+
+
+def _stream_ollama(model: str, prompt: str):
+    """
+    Open a streaming generation on Ollama and return an iterator of its text fragments.
+    
+    The request is sent before this returns, so connection errors and HTTP
+    errors are raised here rather than after the client response has started.
+    There is no retry: a partially streamed response can't be replayed.
+    
+    Args:
+        model: Model name to use
+        prompt: The prompt text
+        
+    Returns:
+        Iterator yielding response text fragments as Ollama produces them
+        
+    Raises:
+        requests.RequestException: If the Ollama call fails
+    """
+    response = _session.post(
+        f"{Config.OLLAMA_URL}/api/generate",
+        data=orjson.dumps({'model': model, 'prompt': prompt, 'stream': True}),
+        headers=_JSON_HEADERS,
+        timeout=(Config.OLLAMA_CONNECT_TIMEOUT, Config.OLLAMA_TIMEOUT),
+        stream=True
+    )
+    try:
+        response.raise_for_status()
+    except requests.RequestException:
+        response.close()
+        raise
+    
+    def fragments():
+        with response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if 'error' in chunk:
+                    raise ValueError(f"Ollama stream error: {chunk['error']}")
+                text = chunk.get('response')
+                if text:
+                    yield text
+                if chunk.get('done'):
+                    break
+    
+    return fragments()
 
 
 # =============================================================================
 # Health and Info Endpoints
 # =============================================================================
 
+# /health is polled constantly by the ALB and its body only changes once a
+# second, so the serialized body is rebuilt at most once per second
+_health_cache = {'second': None, 'body': b''}
+_health_lock = threading.Lock()
+
+
+def _health_body() -> bytes:
+    """Serialized /health payload, cached per second."""
+    now = time.time()
+    second = int(now)
+    with _health_lock:
+        if _health_cache['second'] != second:
+            _health_cache['second'] = second
+            _health_cache['body'] = orjson.dumps({
+                'status': 'healthy',
+                'timestamp': datetime.utcfromtimestamp(second),
+                'uptime_seconds': round(now - app_start_time, 2),
+                'environment': Config.ENVIRONMENT,
+                'container_id': Config.CONTAINER_ID
+            }, option=OrjsonProvider.option)
+        return _health_cache['body']
+
+
 @app.route('/health', methods=['GET'])
-def health_check() -> Tuple[Dict[str, Any], int]:
+@metrics.do_not_track()
+def health_check() -> Response:
     """
     Liveness check endpoint for AWS ALB.
     
     Always returns 200 OK if the container is running.
     This tells the ALB the container is alive, not whether it's ready to serve traffic.
+    Excluded from the default Prometheus request metrics and not logged.
     
     Returns:
         200 OK if container is running
     """
-    uptime = time.time() - app_start_time
-    
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
-        'uptime_seconds': round(uptime, 2),
-        'environment': Config.ENVIRONMENT,
-        'container_id': Config.CONTAINER_ID
-    }), 200
+    return Response(_health_body(), mimetype='application/json')
 
 
 @app.route('/health/ready', methods=['GET'])
@@ -308,25 +498,25 @@ def readiness_check() -> Tuple[Dict[str, Any], int]:
     """
     try:
         # Quick check: can we connect to Ollama?
-        response = requests.get(
+        response = _session.get(
             f"{Config.OLLAMA_URL}/api/tags",
             timeout=2
         )
         response.raise_for_status()
         
-        models = response.json().get('models', [])
+        models = _json_body(response).get('models', [])
         if not models:
             logger.warning(f"[{g.request_id}] No Ollama models available")
             return jsonify({
                 'status': 'not_ready',
                 'reason': 'No models available',
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
+                'timestamp': datetime.utcnow()
             }), 503
         
         return jsonify({
             'status': 'ready',
             'models_available': len(models),
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': datetime.utcnow()
         }), 200
         
     except requests.RequestException as e:
@@ -334,7 +524,7 @@ def readiness_check() -> Tuple[Dict[str, Any], int]:
         return jsonify({
             'status': 'not_ready',
             'reason': 'Ollama service unavailable',
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
+            'timestamp': datetime.utcnow()
         }), 503
 
 
@@ -345,23 +535,24 @@ def api_info() -> Tuple[Dict[str, Any], int]:
     
     Provides metadata about the service and available endpoints.
     """
-    return jsonify({
+    return _json_response({
         'service': 'Ollama API Gateway',
         'version': '1.0.0',
         'environment': Config.ENVIRONMENT,
         'aws_region': Config.AWS_REGION,
         'ecs_cluster': Config.ECS_CLUSTER,
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': datetime.utcnow(),
         'endpoints': {
             'GET /health': 'Liveness check for ALB (always 200)',
             'GET /health/ready': 'Readiness check (503 if Ollama down)',
             'GET /': 'This endpoint',
             'GET /metrics': 'Prometheus metrics',
             'GET /api/models': 'List available models',
-            'POST /api/analyze': 'AI analysis endpoint'
+            'POST /api/analyze': 'AI analysis endpoint',
+            'POST /api/analyze/batch': 'Batch AI analysis endpoint'
         },
         'documentation': 'https://github.com/yourusername/ollama-infra-cli'
-    }), 200
+    })
 
 
 @app.route('/api/models', methods=['GET'])
@@ -376,11 +567,11 @@ def list_models() -> Tuple[Dict[str, Any], int]:
     try:
         models = _get_ollama_models()
         logger.debug(f"Listed {len(models)} available models")
-        return jsonify({
+        return _json_response({
             'models': models,
             'count': len(models),
-            'timestamp': datetime.utcnow().isoformat() + 'Z'
-        }), 200
+            'timestamp': datetime.utcnow()
+        })
     except requests.RequestException as e:
         logger.error(f"Error listing models: {e}")
         return jsonify({
@@ -393,6 +584,12 @@ def list_models() -> Tuple[Dict[str, Any], int]:
 # Analysis Endpoint
 # =============================================================================
 
+def _request_context_label() -> str:
+    """Metrics label from the request's "context" field; safe for non-JSON bodies."""
+    data = request.get_json(silent=True)
+    return str(data.get('context', 'unknown')) if isinstance(data, dict) else 'unknown'
+
+
 @app.route('/api/analyze', methods=['OPTIONS'])
 def analyze_options():
     """Handle CORS preflight requests for /api/analyze."""
@@ -404,7 +601,7 @@ def analyze_options():
 @metrics.histogram(
     'ollama_analyze_duration_seconds',
     'Analysis request duration',
-    labels={'context': lambda: request.json.get('context', 'unknown')}
+    labels={'context': lambda: _request_context_label()}
 )
 def analyze() -> Tuple[Dict[str, Any], int]:
     """
@@ -417,7 +614,8 @@ def analyze() -> Tuple[Dict[str, Any], int]:
         "prompt": "What is Kubernetes?",           # Required: Analysis prompt
         "model": "llama2",                         # Optional: Specific model to use
         "context": "aws|kubernetes|docker",        # Optional: Analysis context
-        "max_tokens": 1000                         # Optional: Response length hint
+        "max_tokens": 1000,                        # Optional: Response length hint
+        "stream": false                            # Optional: Stream NDJSON as tokens arrive
     }
     
     Response JSON:
@@ -426,9 +624,18 @@ def analyze() -> Tuple[Dict[str, Any], int]:
         "model": "llama2",
         "context": "kubernetes",
         "processing_time_ms": 1234,
+        "cached": false,
         "timestamp": "2024-01-01T12:00:00Z"
     }
     
+    Repeated (model, prompt) pairs are answered from an in-process LRU cache
+    with "cached": true; send an X-Cache-Bypass: 1 header to force a fresh
+    generation. Streamed requests are never cached.
+    
+    With "stream": true the response is application/x-ndjson: one
+    {"response": "..."} line per fragment, then a final line with "done": true
+    and the model, context, processing_time_ms and timestamp fields.
+    
     Returns:
         JSON response with AI analysis
     """
@@ -436,13 +643,12 @@ def analyze() -> Tuple[Dict[str, Any], int]:
         client_ip = get_client_ip()
         logger.info(f"[{g.request_id}] Analysis request from {client_ip}")
         
-        # Validate request format
-        if not request.is_json:
-            logger.warning(f"[{g.request_id}] Invalid content-type for /analyze endpoint")
+        # Validate request format; one parse covers both the content type and the body
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            logger.warning(f"[{g.request_id}] Invalid JSON body for /analyze endpoint")
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
-        data = request.get_json()
-        
         # Validate required fields
         if 'prompt' not in data:
             logger.warning(f"[{g.request_id}] Missing prompt field in analyze request")
@@ -481,18 +687,54 @@ def analyze() -> Tuple[Dict[str, Any], int]:
         # Call Ollama
         start_time = time.time()
         try:
-            response = _call_ollama(model, prompt)
+            if data.get('stream'):
+                fragments = _stream_ollama(model, prompt)
+                
+                def generate():
+                    try:
+                        for text in fragments:
+                            yield orjson.dumps({'response': text}, option=orjson.OPT_APPEND_NEWLINE)
+                    except (requests.RequestException, ValueError) as e:
+                        logger.error(f"[{g.request_id}] Ollama stream failed: {e}")
+                        yield orjson.dumps({'error': 'Ollama stream interrupted', 'details': str(e)},
+                                           option=orjson.OPT_APPEND_NEWLINE)
+                        return
+                    processing_time_ms = round((time.time() - start_time) * 1000, 2)
+                    logger.info(f"[{g.request_id}] Streamed analysis completed in {processing_time_ms}ms")
+                    yield orjson.dumps({
+                        'done': True,
+                        'model': model,
+                        'context': context,
+                        'processing_time_ms': processing_time_ms,
+                        'timestamp': datetime.utcnow()
+                    }, option=OrjsonProvider.option | orjson.OPT_APPEND_NEWLINE)
+                
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+            
+            cache_key = (model, hashlib.blake2b(prompt.encode(), digest_size=16).digest())
+            response = None
+            if request.headers.get('X-Cache-Bypass', '').lower() not in ('1', 'true', 'yes'):
+                with _response_cache_lock:
+                    response = _response_cache.get(cache_key)
+            cached = response is not None
+            
+            if not cached:
+                response = _call_ollama(model, prompt)
+                with _response_cache_lock:
+                    _response_cache[cache_key] = response
             processing_time_ms = round((time.time() - start_time) * 1000, 2)
             
-            logger.info(f"[{g.request_id}] Analysis completed successfully in {processing_time_ms}ms")
+            logger.info(f"[{g.request_id}] Analysis completed successfully in {processing_time_ms}ms (cached={cached})")
             
-            return jsonify({
-                'response': response,
-                'model': model,
-                'context': context,
-                'processing_time_ms': processing_time_ms,
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
-            }), 200
+            body = _ANALYZE_TEMPLATE % (
+                orjson.dumps(response),
+                orjson.dumps(model),
+                orjson.dumps(context),
+                orjson.dumps(processing_time_ms),
+                b'true' if cached else b'false',
+                orjson.dumps(datetime.utcnow(), option=OrjsonProvider.option)
+            )
+            return Response(body, mimetype='application/json')
             
         except requests.Timeout:
             logger.error(f"[{g.request_id}] Ollama request timed out after {Config.OLLAMA_TIMEOUT}s")
@@ -521,6 +763,127 @@ def analyze() -> Tuple[Dict[str, Any], int]:
         }), 500
 
 
+# Shared pool for batch entries; each one is an independent Ollama call
+_batch_executor = ThreadPoolExecutor(max_workers=Config.BATCH_WORKERS)
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+@metrics.counter('ollama_analyze_batch_requests', 'Batch analysis endpoint calls')
+def analyze_batch() -> Tuple[Dict[str, Any], int]:
+    """
+    Batch AI analysis endpoint.
+    
+    Runs several prompts against Ollama concurrently and returns the results
+    in request order. A failing entry gets an error object in its slot and
+    doesn't fail the whole batch.
+    
+    Request JSON:
+    {
+        "prompts": [                               # Required: 1..MAX_BATCH_SIZE entries
+            {"prompt": "What is Kubernetes?",      # Required: Analysis prompt
+             "model": "llama2",                    # Optional: Specific model to use
+             "context": "kubernetes"}              # Optional: Analysis context
+        ],
+        "context": "general"                       # Optional: Default context for entries
+    }
+    
+    Response JSON:
+    {
+        "results": [{"response": "...", "model": "llama2", "context": "kubernetes",
+                     "processing_time_ms": 1234}],
+        "count": 1,
+        "processing_time_ms": 1300,
+        "timestamp": "2024-01-01T12:00:00Z"
+    }
+    
+    Returns:
+        JSON response with one result per prompt
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            logger.warning(f"[{g.request_id}] Invalid JSON body for /analyze/batch endpoint")
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        entries = data.get('prompts')
+        
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'error': 'Field "prompts" must be a non-empty list'}), 400
+        
+        if len(entries) > Config.MAX_BATCH_SIZE:
+            logger.warning(f"[{g.request_id}] Batch too large: {len(entries)} > {Config.MAX_BATCH_SIZE}")
+            return jsonify({
+                'error': f'Batch exceeds maximum size of {Config.MAX_BATCH_SIZE} prompts'
+            }), 413
+        
+        # Validate every entry before calling Ollama for any of them
+        default_context = str(data.get('context', 'general')).lower()
+        jobs = []
+        for index, entry in enumerate(entries):
+            prompt = str(entry.get('prompt', '')).strip() if isinstance(entry, dict) else ''
+            if not prompt:
+                return jsonify({'error': f'Entry {index}: prompt is required'}), 400
+            if len(prompt) > Config.MAX_PROMPT_LENGTH:
+                return jsonify({
+                    'error': f'Entry {index}: prompt exceeds maximum length of {Config.MAX_PROMPT_LENGTH} characters'
+                }), 413
+            context = str(entry.get('context', default_context)).lower()
+            jobs.append((prompt, entry.get('model'), context))
+        
+        # Resolve the default model once for all entries that don't name one
+        default_model = None
+        if any(not model for _, model, _ in jobs):
+            try:
+                default_model = _select_best_model(_get_ollama_models())
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"[{g.request_id}] Failed to get models: {e}")
+                return jsonify({'error': 'Cannot connect to Ollama service or no models available'}), 503
+        
+        logger.info(f"[{g.request_id}] Batch analysis request: {len(jobs)} prompts")
+        
+        # Workers get a fresh app context, and with it an empty g
+        request_id = g.request_id
+        
+        def run_one(prompt: str, model: str, context: str) -> Dict[str, Any]:
+            g.request_id = request_id
+            start = time.time()
+            try:
+                response = _call_ollama(model, prompt)
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"[{g.request_id}] Batch entry failed: {e}")
+                return {'error': 'Analysis failed', 'details': str(e), 'model': model, 'context': context}
+            return {
+                'response': response,
+                'model': model,
+                'context': context,
+                'processing_time_ms': round((time.time() - start) * 1000, 2)
+            }
+        
+        start_time = time.time()
+        futures = [
+            _batch_executor.submit(copy_current_request_context(run_one), prompt, model or default_model, context)
+            for prompt, model, context in jobs
+        ]
+        results = [future.result() for future in futures]
+        processing_time_ms = round((time.time() - start_time) * 1000, 2)
+        
+        logger.info(f"[{g.request_id}] Batch analysis completed in {processing_time_ms}ms")
+        
+        return _json_response({
+            'results': results,
+            'count': len(results),
+            'processing_time_ms': processing_time_ms,
+            'timestamp': datetime.utcnow()
+        })
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in batch analyze endpoint: {e}", exc_info=True)
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred'
+        }), 500
+
+
 # =============================================================================
 # Error Handlers
 # =============================================================================
@@ -554,7 +917,7 @@ def internal_error(error: Any) -> Tuple[Dict[str, Any], int]:
     return jsonify({
         'error': 'Internal server error',
         'request_id': g.request_id,
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': datetime.utcnow()
     }), 500
 
 
@@ -562,12 +925,24 @@ def internal_error(error: Any) -> Tuple[Dict[str, Any], int]:
 # Request Logging and Security
 # =============================================================================
 
+# Headers that are the same on every response
+_STATIC_HEADERS = {
+    # CORS headers for demo.html access
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Request-ID, X-Cache-Bypass',
+    # Security headers
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+}
+
+
 @app.after_request
 def add_security_headers(response: Response) -> Response:
-    """Add security headers to all responses."""
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['X-XSS-Protection'] = '1; mode=block'
+    """Add request ID, CORS and security headers to all responses."""
+    response.headers.update(_STATIC_HEADERS)
+    response.headers['X-Request-ID'] = g.get('request_id', 'unknown')
     
     # Only add HSTS if using HTTPS (check X-Forwarded-Proto for ALB)
     is_secure = request.is_secure or request.headers.get('X-Forwarded-Proto') == 'https'
@@ -31,14 +31,19 @@ Prerequisites:
     - At least one model pulled: ollama pull llama2
 """
 
-import argparse
+from __future__ import annotations
+
+import atexit
 import json
-import logging
 import os
 import sys
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import logging
 
-import requests
+__version__ = '1.0.0'
 
 # =============================================================================
 # Configuration
@@ -49,9 +54,26 @@ DEFAULT_MODEL = os.environ.get('OLLAMA_MODEL')
 TIMEOUT = int(os.environ.get('OLLAMA_TIMEOUT', '300'))  # 5 minutes for AI responses
 DEBUG = os.environ.get('DEBUG', '').lower() == 'true'
 
+# One session per process so `run` without --model reuses the connection
+# opened by the model lookup. Created on first use so that `--help` and
+# argument errors never pay for importing requests.
+_session = None
+
+
+def _get_session():
+    """Return the shared requests session, importing requests on first call."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
 
 def setup_logging(debug: bool = False) -> logging.Logger:
     """Configure logging."""
+    # Only debug runs log through logging, so only they pay for importing it
+    import logging
+    
     level = logging.DEBUG if debug else logging.INFO
     
     handler = logging.StreamHandler(sys.stderr)
@@ -65,35 +87,51 @@ def setup_logging(debug: bool = False) -> logging.Logger:
     return logger
 
 
+class _NoopLogger:
+    """Stand-in logger for non-debug runs: drops debug/info/warning, prints errors."""
+    
+    debug = info = warning = staticmethod(lambda *a, **k: None)
+    
+    def error(self, msg, *args, **kwargs):
+        print(f"ERROR: {msg % args if args else msg}", file=sys.stderr)
+
+
+_NOOP_LOGGER = _NoopLogger()
+
+
 # =============================================================================
 # Ollama Integration
 # =============================================================================
 
 def list_models(logger: logging.Logger) -> List[str]:
     """Fetch available Ollama models from server."""
+    import requests
+    
     try:
-        response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=TIMEOUT)
+        response = _get_session().get(f"{OLLAMA_URL}/api/tags", timeout=TIMEOUT)
         response.raise_for_status()
         
         models = response.json().get("models", [])
         return [m.get("name") for m in models if m.get("name")]
         
     except requests.exceptions.ConnectionError:
-        logger.error(f"Cannot connect to Ollama at {OLLAMA_URL}")
+        logger.error("Cannot connect to Ollama at %s", OLLAMA_URL)
         logger.error("Is it running? Try: ollama serve")
         return []
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching models: {e}")
+        logger.error("Error fetching models: %s", e)
         return []
 
 
 def run_prompt(prompt: str, model: str, logger: logging.Logger) -> str:
     """Send prompt to Ollama model and get response."""
+    import requests
+    
     try:
         payload = {"model": model, "prompt": prompt, "stream": False}
         
-        logger.debug(f"Sending prompt to {model}...")
-        response = requests.post(
+        logger.debug("Sending prompt to %s...", model)
+        response = _get_session().post(
             f"{OLLAMA_URL}/api/generate",
             json=payload,
             timeout=TIMEOUT
@@ -122,7 +160,14 @@ def run_prompt(prompt: str, model: str, logger: logging.Logger) -> str:
 # CLI Command Handlers
 # =============================================================================
 
-def cmd_list(logger: logging.Logger) -> None:
+def _fast_exit(code: int) -> None:
+    """Flush output and exit immediately, skipping interpreter teardown."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+def cmd_list(args: SimpleNamespace, logger: logging.Logger) -> None:
     """Handle 'list' command - show available Ollama models."""
     try:
         models = list_models(logger)
@@ -136,12 +181,14 @@ def cmd_list(logger: logging.Logger) -> None:
             print(f"  • {model}")
             
     except Exception as e:
-        logger.error(f"Error: {e}")
-        sys.exit(1)
+        logger.error("Error: %s", e)
+        _fast_exit(1)
 
 
-def cmd_run(args: argparse.Namespace, logger: logging.Logger) -> None:
+def cmd_run(args: SimpleNamespace, logger: logging.Logger) -> None:
     """Handle 'run' command - execute a prompt."""
+    import requests
+    
     try:
         # Get prompt from different sources
         prompt = args.prompt
@@ -160,7 +207,7 @@ def cmd_run(args: argparse.Namespace, logger: logging.Logger) -> None:
         
         if not prompt:
             logger.error("Prompt is required")
-            sys.exit(1)
+            _fast_exit(1)
         
         # Determine model to use
         model = args.model or DEFAULT_MODEL
@@ -169,7 +216,7 @@ def cmd_run(args: argparse.Namespace, logger: logging.Logger) -> None:
             if not models:
                 logger.error("No Ollama models available")
                 logger.error("Pull a model with: ollama pull llama2")
-                sys.exit(1)
+                _fast_exit(1)
             model = models[0]
             print(f"Using model: {model}", file=sys.stderr)
         
@@ -178,23 +225,59 @@ def cmd_run(args: argparse.Namespace, logger: logging.Logger) -> None:
         print(response)
         
     except requests.RequestException as e:
-        logger.error(f"Error: {e}")
-        sys.exit(1)
+        logger.error("Error: %s", e)
+        _fast_exit(1)
     except Exception as e:
-        logger.error(f"Error: {e}")
-        sys.exit(1)
+        logger.error("Error: %s", e)
+        _fast_exit(1)
+
+
+# Subcommand name -> handler; handlers take the parsed args and a logger
+_COMMANDS = {
+    'list': cmd_list,
+    'run': cmd_run,
+}
 
 
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
-def main() -> None:
-    """Main entry point with argument parsing."""
-    parser = argparse.ArgumentParser(
-        description="Ollama CLI - Pipe any data through local AI for analysis",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_USAGE = "usage: {prog} [-h] [--version] [--debug] {{list,run}} ..."
+_RUN_USAGE = "usage: {prog} run [-h] [--model MODEL] [prompt]"
+
+_HELP = _USAGE + """
+
+Ollama CLI - Pipe any data through local AI for analysis
+
+positional arguments:
+  {{list,run}}
+    list      List available Ollama models
+    run       Run a prompt
+
+options:
+  -h, --help  show this help message and exit
+  --version   show program's version number and exit
+  --debug     Enable debug logging
+"""
+
+_LIST_HELP = """usage: {prog} list [-h]
+
+options:
+  -h, --help  show this help message and exit
+"""
+
+_RUN_HELP = _RUN_USAGE + """
+
+positional arguments:
+  prompt         Prompt text (optional, can be piped)
+
+options:
+  -h, --help     show this help message and exit
+  --model MODEL  Specific model to use
+"""
+
+_EPILOG = """
 Examples:
   # List available models
   python cli.py list
@@ -216,40 +299,112 @@ Environment Variables:
   OLLAMA_TIMEOUT   Request timeout in seconds (default: 60)
   DEBUG            Enable debug logging (true/false)
 """
-    )
+
+
+def _usage_error(usage: str, prog: str, message: str) -> None:
+    """Print usage and an error message to stderr, then exit with status 2."""
+    print(usage.format(prog=prog.split()[0]), file=sys.stderr)
+    print(f"{prog}: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+def _parse(argv: List[str], prog: str) -> SimpleNamespace:
+    """
+    Parse command line arguments for the two-command surface.
+    
+    Accepts [--version] [--debug] {list,run} and, for run, [--model MODEL |
+    --model=MODEL] [prompt]. Prints help or the version and exits on
+    -h/--help or --version; exits with status 2 on
+    usage errors, with the same messages the old argument parser gave.
+    """
+    args = SimpleNamespace(command=None, debug=False, model=None, prompt=None)
+    extras = []
+    only_positional = False
     
-    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        
+        if only_positional or not arg.startswith('-') or arg == '-':
+            if args.command is None:
+                if arg not in _COMMANDS:
+                    _usage_error(_USAGE, prog, f"argument command: invalid choice: '{arg}' (choose from 'list', 'run')")
+                args.command = arg
+            elif args.command == 'run' and args.prompt is None:
+                args.prompt = arg
+            else:
+                extras.append(arg)
+        elif arg == '--':
+            only_positional = True
+        elif arg in ('-h', '--help'):
+            if args.command == 'run':
+                sys.stdout.write(_RUN_HELP.format(prog=prog))
+            elif args.command == 'list':
+                sys.stdout.write(_LIST_HELP.format(prog=prog))
+            else:
+                sys.stdout.write(_HELP.format(prog=prog) + _EPILOG)
+            sys.exit(0)
+        elif arg == '--version' and args.command is None:
+            print(f"{prog} {__version__}")
+            sys.exit(0)
+        elif arg == '--debug' and args.command is None:
+            args.debug = True
+        elif args.command == 'run' and (arg == '--model' or arg.startswith('--model=')):
+            if arg == '--model':
+                if i >= len(argv) or argv[i].startswith('-'):
+                    _usage_error(_RUN_USAGE, f"{prog} run", "argument --model: expected one argument")
+                args.model = argv[i]
+                i += 1
+            else:
+                args.model = arg[len('--model='):]
+        else:
+            extras.append(arg)
     
-    subparsers = parser.add_subparsers(dest='command', required=True)
+    if args.command is None:
+        _usage_error(_USAGE, prog, "the following arguments are required: command")
+    if extras:
+        _usage_error(_USAGE, prog, f"unrecognized arguments: {' '.join(extras)}")
     
-    # List command
-    subparsers.add_parser('list', help='List available Ollama models')
+    return args
+
+
+def main() -> None:
+    """Main entry point with argument parsing."""
+    argv = sys.argv[1:]
+    prog = os.path.basename(sys.argv[0])
     
-    # Run command
-    run_parser = subparsers.add_parser('run', help='Run a prompt')
-    run_parser.add_argument('prompt', nargs='?', help='Prompt text (optional, can be piped)')
-    run_parser.add_argument('--model', help='Specific model to use')
+    # Help and version need neither parsing nor logging
+    if argv[:1] in (['-h'], ['--help']):
+        sys.stdout.write(_HELP.format(prog=prog) + _EPILOG)
+        return
+    if argv == ['--version']:
+        print(f"{prog} {__version__}")
+        return
     
-    args = parser.parse_args()
+    args = _parse(argv, prog)
     
-    # Setup logging
-    logger = setup_logging(debug=args.debug or DEBUG)
-    logger.debug(f"Ollama URL: {OLLAMA_URL}")
-    logger.debug(f"Timeout: {TIMEOUT}s")
+    # Setup logging; without debug there is nothing to configure
+    debug = args.debug or DEBUG
+    if debug:
+        logger = setup_logging(debug=debug)
+        logger.debug("Ollama URL: %s", OLLAMA_URL)
+        logger.debug("Timeout: %ss", TIMEOUT)
+    else:
+        logger = _NOOP_LOGGER
     
-    # Route to handlers
-    try:
-        if args.command == 'list':
-            cmd_list(logger)
-        elif args.command == 'run':
-            cmd_run(args, logger)
-    except KeyboardInterrupt:
-        print("\nInterrupted", file=sys.stderr)
-        sys.exit(130)
-    except Exception as e:
-        logger.error(f"Error: {e}")
-        sys.exit(1)
+    # Route to handlers; each handler reports its own errors
+    _COMMANDS[args.command](args, logger)
+    
+    # requests pulls in logging, but without debug no handlers were configured,
+    # so logging's exit hook has nothing to flush
+    if not debug and 'logging' in sys.modules:
+        atexit.unregister(sys.modules['logging'].shutdown)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted", file=sys.stderr)
+        _fast_exit(130)
\ No newline at end of file
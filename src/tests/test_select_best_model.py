@@ -0,0 +1,56 @@
+"""Tests for preferred-model selection in the API gateway."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app, g, _select_best_model  # noqa: E402
+
+
+def _baseline(models):
+    """Reference behaviour: first model containing the highest-ranked preference."""
+    from app import Config
+    for preferred in Config.PREFERRED_MODELS:
+        for model in models:
+            if preferred.lower() in model.lower():
+                return model
+    return models[0]
+
+
+@pytest.fixture(autouse=True)
+def request_context():
+    with app.test_request_context():
+        g.request_id = 'test'
+        yield
+
+
+@pytest.mark.parametrize('models', [
+    ['mistral:7b', 'mistrallama2'],
+    ['llama2:13b', 'llama3:8b', 'llama3.1:70b'],
+    ['LLaMA3:8b', 'mistral:7b'],
+    ['neural-chat', 'mistral-llama3'],
+    ['codellama:7b', 'phi3'],
+])
+def test_matches_preference_order(models):
+    assert _select_best_model(models) == _baseline(models)
+
+
+def test_overlapping_preference_wins():
+    # 'llama2' overlaps the lower-ranked 'mistral' match in the second name
+    assert _select_best_model(['mistral:7b', 'mistrallama2']) == 'mistrallama2'
+
+
+def test_first_model_on_ties():
+    assert _select_best_model(['llama3:8b', 'llama3:70b']) == 'llama3:8b'
+
+
+def test_falls_back_to_first_model():
+    assert _select_best_model(['phi3', 'gemma']) == 'phi3'
+
+
+def test_no_models_raises():
+    with pytest.raises(ValueError):
+        _select_best_model([])